@@ -1,46 +1,265 @@
 #!/usr/bin/env python3
 """Get the latest stable version of Neovim from GitHub releases."""
 
+import functools
+import gzip
+import hashlib
+import http.client
+import json
+import os
 import re
 import sys
-import urllib.error
-import urllib.request
+import tempfile
+import time
+import urllib.parse
 
+GITHUB_API_URL = "https://api.github.com/repos/neovim/neovim/releases/latest"
+GITHUB_RELEASES_URL = "https://github.com/neovim/neovim/releases/latest"
 
-def get_latest_version():
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "gentoo-ai-update",
+)
+CACHE_TTL = 24 * 60 * 60  # Reuse a cached release without asking GitHub
+NEGATIVE_CACHE_TTL = 6 * 60 * 60  # How long a 404 skips the API entirely
+
+# Kept-alive HTTPS connections, one per host. The releases page redirects to
+# the tagged release on the same host, so one handshake covers the lookup.
+_CONNECTIONS = {}
+
+_TAG_HTML_RE = re.compile(r"tag/v([0-9]+\.[0-9]+\.[0-9]+)")
+
+
+def get_connection(host, timeout=30):
+    """Return the shared HTTPS connection for host, opening it on first use."""
+    conn = _CONNECTIONS.get(host)
+    if conn is None:
+        conn = http.client.HTTPSConnection(host, timeout=timeout)
+        _CONNECTIONS[host] = conn
+    return conn
+
+
+def http_get(url, headers, timeout=30):
+    """GET url over the shared connection; return (status, headers, body)."""
+    parts = urllib.parse.urlsplit(url)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    headers = {"Accept-Encoding": "gzip", **headers}
+
+    for attempt in range(2):
+        conn = get_connection(parts.netloc, timeout)
+        try:
+            conn.request("GET", path, headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+            if response.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            return response.status, response.headers, body
+        except (http.client.HTTPException, ConnectionError):
+            # The server may drop an idle keep-alive connection; reconnect once
+            conn.close()
+            _CONNECTIONS.pop(parts.netloc, None)
+            if attempt:
+                raise
+
+
+def is_release_version(version):
+    """Return True for a plain X.Y.Z release version."""
+    parts = version.split(".")
+    return len(parts) == 3 and all(p.isascii() and p.isdigit() for p in parts)
+
+
+def _cache_path(url):
+    return os.path.join(CACHE_DIR, hashlib.sha1(url.encode()).hexdigest() + ".json")
+
+
+def load_cached(url):
+    """Return the cached response entry for url, or None."""
+    try:
+        with open(_cache_path(url), encoding="utf-8") as f:
+            return json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def store_cached(url, entry):
+    """Write a response entry to the cache; errors are reported, not raised."""
+    path = _cache_path(url)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        data = json.dumps(entry)
+        # Unique temp name: concurrent runs must not share a half-written file
+        fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError as e:
+        print(f"Warning: could not write cache {path}: {e}", file=sys.stderr)
+
+
+def _rate_limit_key(token):
+    # Shared with other get_latest_version.py scripts: the quota is per
+    # token (or per IP when anonymous)
+    return "github-rate-limit:" + ("token" if token else "anonymous")
+
+
+def record_rate_limit(headers, token):
+    """Store the REST quota reported by a GitHub API response.
+
+    Only a zero quota is written to disk; a healthy response just removes
+    any earlier record.
+    """
+    remaining = headers.get("X-RateLimit-Remaining")
+    reset = headers.get("X-RateLimit-Reset")
+    if remaining is None or reset is None:
+        return
+    if headers.get("X-RateLimit-Resource", "core") != "core":
+        return
+    if int(remaining) > 0:
+        try:
+            os.remove(_cache_path(_rate_limit_key(token)))
+        except OSError:
+            pass
+        return
+    store_cached(
+        _rate_limit_key(token), {"remaining": int(remaining), "reset": int(reset)}
+    )
+
+
+def rate_limit_exhausted(token):
+    """True while a recorded zero quota hasn't reached its reset time."""
+    state = load_cached(_rate_limit_key(token))
+    if not state:
+        return False
+    return state.get("remaining") == 0 and time.time() < state.get("reset", 0)
+
+
+def fetch_from_api():
+    """Fetch the latest release tag from the GitHub API.
+
+    A fresh cache entry is used as-is; a stale one is revalidated with its
+    ETag and Last-Modified. With a known-exhausted quota no request is sent:
+    the stale tag is returned if there is one. A 404 is remembered for
+    NEGATIVE_CACHE_TTL. Raises RuntimeError when the API can't answer (e.g.
+    403 rate limit, 404, exhausted quota and nothing cached).
+    """
+    cached = load_cached(GITHUB_API_URL)
+    if cached and cached.get("not_found"):
+        if time.time() - cached.get("fetched_at", 0) < NEGATIVE_CACHE_TTL:
+            raise RuntimeError("GitHub API returned HTTP 404 (cached)")
+        cached = None
+    if cached and time.time() - cached.get("fetched_at", 0) < CACHE_TTL:
+        print("Using cached GitHub API response", file=sys.stderr)
+        return cached["body"]["tag_name"]
+
+    token = os.environ.get("GITHUB_TOKEN")
+    if rate_limit_exhausted(token):
+        if cached:
+            print("GitHub API quota used up; using stale cache", file=sys.stderr)
+            return cached["body"]["tag_name"]
+        raise RuntimeError("GitHub API rate limit exhausted")
+
+    headers = {
+        "Accept": "application/vnd.github+json",
+        "User-Agent": "gentoo-get-latest-version/1.0",
+    }
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+    if token:
+        headers["Authorization"] = f"token {token}"
+
+    try:
+        status, response_headers, body = http_get(GITHUB_API_URL, headers)
+    except (http.client.HTTPException, OSError) as e:
+        raise RuntimeError(f"GitHub API request failed: {e}")
+
+    record_rate_limit(response_headers, token)
+
+    if status == 304 and cached:
+        cached["fetched_at"] = time.time()
+        store_cached(GITHUB_API_URL, cached)
+        return cached["body"]["tag_name"]
+    if status == 404:
+        store_cached(GITHUB_API_URL, {"not_found": True, "fetched_at": time.time()})
+    if status != 200:
+        raise RuntimeError(f"GitHub API returned HTTP {status}")
+
+    data = json.loads(body.decode("utf-8"))
+    if not data.get("tag_name") or data.get("prerelease"):
+        raise RuntimeError("GitHub API returned no stable release")
+
+    release = {"tag_name": data["tag_name"]}
+    store_cached(
+        GITHUB_API_URL,
+        {
+            "etag": response_headers.get("ETag"),
+            "last_modified": response_headers.get("Last-Modified"),
+            "body": release,
+            "fetched_at": time.time(),
+        },
+    )
+    return release["tag_name"]
+
+
+def fetch_from_html():
     """Fetch latest stable version from GitHub releases page."""
-    url = "https://github.com/neovim/neovim/releases/latest"
+    url = GITHUB_RELEASES_URL
+    headers = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+    }
 
     try:
-        req = urllib.request.Request(
-            url,
-            headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            },
-        )
-
-        with urllib.request.urlopen(req, timeout=30) as response:
-            # The response is a redirect to the actual release page
-            # The URL contains the version tag
-            final_url = response.geturl()
-
-            # Extract version from URL like .../releases/tag/v0.11.6
-            match = re.search(r"/tag/v?([0-9]+\.[0-9]+\.[0-9]+)", final_url)
-            if match:
-                return match.group(1)
-
-            # Fallback: try to read content and find version
-            content = response.read().decode("utf-8")
-            match = re.search(r"tag/v([0-9]+\.[0-9]+\.[0-9]+)", content)
-            if match:
-                return match.group(1)
-
-        raise ValueError("raise: Could not extract version from GitHub response")
-
-    except urllib.error.HTTPError as e:
-        raise ValueError(f"raise: HTTP error {e.code} when fetching {url}: {e.reason}")
-    except urllib.error.URLError as e:
-        raise ValueError(f"raise: URL error when fetching {url}: {e.reason}")
+        status, response_headers, body = http_get(url, headers)
+    except (http.client.HTTPException, OSError) as e:
+        raise ValueError(f"raise: URL error when fetching {url}: {e}")
+
+    if status in (301, 302, 303, 307, 308):
+        # The response is a redirect to the actual release page; the Location
+        # header already carries the version tag, so don't follow it
+        final_url = response_headers.get("Location", "")
+    elif status == 200:
+        final_url = url
+    else:
+        raise ValueError(f"raise: HTTP error {status} when fetching {url}")
+
+    # Extract version from URL like .../releases/tag/v0.11.6
+    _, _, tag = urllib.parse.urlsplit(final_url).path.rpartition("/tag/")
+    version = tag.removeprefix("v")
+    if is_release_version(version):
+        return version
+
+    # Fallback: try to read content and find version
+    content = body.decode("utf-8", "replace")
+    match = _TAG_HTML_RE.search(content)
+    if match:
+        return match.group(1)
+
+    raise ValueError("raise: Could not extract version from GitHub response")
+
+
+# One lookup per process when imported; a raised error isn't cached, so
+# calling again retries.
+@functools.lru_cache(maxsize=None)
+def get_latest_version():
+    """Fetch latest stable version, API first with the release page as fallback."""
+    try:
+        tag_name = fetch_from_api()
+    except RuntimeError as e:
+        print(f"{e}; falling back to the releases page", file=sys.stderr)
+        return fetch_from_html()
+
+    version = tag_name.removeprefix("v")
+    if not is_release_version(version):
+        raise ValueError(f"raise: Unexpected release tag format: {tag_name}")
+    return version
 
 
 def main():
@@ -1,58 +1,308 @@
 #!/usr/bin/env python3
 """Fetch the latest stable version of app-misc/fastfetch from GitHub."""
 
+import functools
+import gzip
+import hashlib
+import http.client
 import json
 import os
 import re
 import sys
-import urllib.request
-from urllib.error import URLError, HTTPError
+import tempfile
+import time
+import urllib.parse
 
 GITHUB_API_URL = "https://api.github.com/repos/fastfetch-cli/fastfetch/releases/latest"
 GITHUB_TAGS_URL = "https://api.github.com/repos/fastfetch-cli/fastfetch/tags"
 GITHUB_RELEASES_URL = "https://github.com/fastfetch-cli/fastfetch/releases/latest"
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+
+# Newest tags by commit date; GraphQL returns just the names (tens of bytes)
+# where the REST tags listing returns a page of tag objects with commit info.
+GITHUB_TAGS_QUERY = """
+query {
+  repository(owner: "fastfetch-cli", name: "fastfetch") {
+    refs(refPrefix: "refs/tags/", first: 10,
+         orderBy: {field: TAG_COMMIT_DATE, direction: DESC}) {
+      nodes { name }
+    }
+  }
+}
+"""
+
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "gentoo-ai-update",
+)
+CACHE_TTL = 24 * 60 * 60  # Serve cached API responses without revalidating
+NEGATIVE_CACHE_TTL = 6 * 60 * 60  # Remember 404s so they aren't re-requested
+
+_PRERELEASE_RE = re.compile(r"-(alpha|beta|rc|pre|dev)", re.I)
+_VERSION_RE = re.compile(r"^\d[\d.]*$")
+_TITLE_VERSION_RE = re.compile(r"<title>\s*Release\s+(?:v)?([\d.]+)", re.IGNORECASE)
+_HTML_TAG_RE = re.compile(r'/releases/tag/(?:v)?([\d.]+)"')
+
+# Kept-alive HTTPS connections, one per host, so the releases API call and the
+# tags API fallback share a single TCP+TLS handshake.
+_CONNECTIONS = {}
+
+
+def get_connection(host, timeout=30):
+    """Return the shared HTTPS connection for host, opening it on first use."""
+    conn = _CONNECTIONS.get(host)
+    if conn is None:
+        conn = http.client.HTTPSConnection(host, timeout=timeout)
+        _CONNECTIONS[host] = conn
+    return conn
+
+
+def http_request(url, headers, timeout=30, method="GET", body=None):
+    """Send a request over the shared connection; return (status, headers, body)."""
+    parts = urllib.parse.urlsplit(url)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    headers = {"Accept-Encoding": "gzip", **headers}
+
+    for attempt in range(2):
+        conn = get_connection(parts.netloc, timeout)
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+            if response.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            return response.status, response.headers, body
+        except (http.client.HTTPException, ConnectionError):
+            # The server may drop an idle keep-alive connection; reconnect once
+            conn.close()
+            _CONNECTIONS.pop(parts.netloc, None)
+            if attempt:
+                raise
+
+
+def _cache_path(url):
+    return os.path.join(CACHE_DIR, hashlib.sha1(url.encode()).hexdigest() + ".json")
+
+
+def load_cached(url):
+    """Return the cached API response entry for url, or None."""
+    try:
+        with open(_cache_path(url), encoding="utf-8") as f:
+            return json.loads(f.read())
+    except (OSError, ValueError):
+        return None
 
 
-def make_api_request(url, timeout=30):
-    """Make authenticated request to GitHub API."""
+def store_cached(url, entry):
+    """Persist an API response entry; failures only cost a future request."""
+    path = _cache_path(url)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        data = json.dumps(entry)
+        # Unique temp name: concurrent runs must not share a half-written file
+        fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError as e:
+        print(f"Warning: could not write cache {path}: {e}", file=sys.stderr)
+
+
+def _rate_limit_key(token):
+    # GitHub quotas are per token (or per IP when anonymous), not per URL
+    return "github-rate-limit:" + ("token" if token else "anonymous")
+
+
+def record_rate_limit(headers, token):
+    """Remember the REST quota GitHub reported alongside a response.
+
+    Only an exhausted quota is persisted; otherwise any old record is
+    dropped, so a normal run doesn't rewrite the file on every response.
+    """
+    remaining = headers.get("X-RateLimit-Remaining")
+    reset = headers.get("X-RateLimit-Reset")
+    if remaining is None or reset is None:
+        return
+    if headers.get("X-RateLimit-Resource", "core") != "core":
+        return
+    if int(remaining) > 0:
+        try:
+            os.remove(_cache_path(_rate_limit_key(token)))
+        except OSError:
+            pass
+        return
+    store_cached(
+        _rate_limit_key(token), {"remaining": int(remaining), "reset": int(reset)}
+    )
+
+
+def rate_limit_exhausted(token):
+    """True if the last response said the quota is used up until a future reset."""
+    state = load_cached(_rate_limit_key(token))
+    if not state:
+        return False
+    return state.get("remaining") == 0 and time.time() < state.get("reset", 0)
+
+
+def release_fields(data):
+    """Keep only what fetch_latest_version reads from a release object."""
+    return {"tag_name": data.get("tag_name"), "prerelease": data.get("prerelease")}
+
+
+def tag_names(data):
+    """Keep only the names from a tags listing."""
+    return [{"name": tag.get("name", "")} for tag in data]
+
+
+def make_api_request(url, timeout=30, extract=None):
+    """Make authenticated request to GitHub API.
+
+    Responses are cached on disk: within CACHE_TTL the cached body is returned
+    without a request, afterwards it is revalidated with If-None-Match /
+    If-Modified-Since so an unchanged release costs a 304 instead of a full
+    response (and 304s don't count against the GitHub rate limit). While the
+    last seen X-RateLimit-Remaining is 0, no request is made at all: a stale
+    cached body is returned if there is one, otherwise RuntimeError. A 404 is
+    remembered for NEGATIVE_CACHE_TTL and re-raised without a request.
+
+    If given, extract reduces the decoded JSON to the fields the caller
+    needs; only that reduced value is cached and returned, so the release
+    notes, assets and uploader objects are dropped right after decoding.
+    """
+    cached = load_cached(url)
+    if cached and cached.get("not_found"):
+        if time.time() - cached.get("fetched_at", 0) < NEGATIVE_CACHE_TTL:
+            print(f"Cached 404 for {url}, skipping request", file=sys.stderr)
+            raise RuntimeError("API endpoint not found")
+        cached = None
+    if cached and time.time() - cached.get("fetched_at", 0) < CACHE_TTL:
+        print(f"Using cached response for {url}", file=sys.stderr)
+        return cached["body"]
+
+    # Use GitHub token if available (from environment variable)
+    token = os.environ.get("GITHUB_TOKEN")
+    if rate_limit_exhausted(token):
+        if cached:
+            print(
+                f"GitHub API rate limit exhausted, using stale cache for {url}",
+                file=sys.stderr,
+            )
+            return cached["body"]
+        print("GitHub API rate limit exhausted, skipping request", file=sys.stderr)
+        raise RuntimeError("GitHub API rate limit exhausted")
+
     headers = {
         "Accept": "application/vnd.github.v3+json",
         "User-Agent": "gentoo-get-latest-version/1.0",
     }
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
 
-    # Use GitHub token if available (from environment variable)
-    token = os.environ.get("GITHUB_TOKEN")
     if token:
         headers["Authorization"] = f"token {token}"
         print("Using GITHUB_TOKEN from environment", file=sys.stderr)
 
-    req = urllib.request.Request(url, headers=headers)
-
     try:
-        with urllib.request.urlopen(req, timeout=timeout) as response:
-            return json.loads(response.read().decode("utf-8"))
-    except HTTPError as e:
-        if e.code == 403:
-            print(
-                f"Error fetching from GitHub API: HTTP Error 403: rate limit exceeded",
-                file=sys.stderr,
-            )
-            raise RuntimeError("Failed to fetch release data from GitHub API")
-        elif e.code == 404:
-            print(
-                f"Error fetching from GitHub API: HTTP Error 404: not found",
-                file=sys.stderr,
-            )
-            raise RuntimeError("API endpoint not found")
-        else:
-            print(
-                f"Error fetching from GitHub API: HTTP Error {e.code}", file=sys.stderr
-            )
-            raise RuntimeError(f"GitHub API returned HTTP {e.code}")
-    except URLError as e:
+        status, response_headers, body = http_request(url, headers, timeout=timeout)
+    except (http.client.HTTPException, OSError) as e:
         print(f"Error fetching from GitHub API: {e}", file=sys.stderr)
         raise RuntimeError(f"Failed to connect to GitHub API: {e}")
 
+    record_rate_limit(response_headers, token)
+
+    if status == 304 and cached:
+        print(f"Cached response for {url} is still current", file=sys.stderr)
+        cached["fetched_at"] = time.time()
+        store_cached(url, cached)
+        return cached["body"]
+    elif status == 403:
+        print(
+            f"Error fetching from GitHub API: HTTP Error 403: rate limit exceeded",
+            file=sys.stderr,
+        )
+        raise RuntimeError("Failed to fetch release data from GitHub API")
+    elif status == 404:
+        print(
+            f"Error fetching from GitHub API: HTTP Error 404: not found",
+            file=sys.stderr,
+        )
+        store_cached(url, {"not_found": True, "fetched_at": time.time()})
+        raise RuntimeError("API endpoint not found")
+    elif status != 200:
+        print(f"Error fetching from GitHub API: HTTP Error {status}", file=sys.stderr)
+        raise RuntimeError(f"GitHub API returned HTTP {status}")
+
+    data = json.loads(body.decode("utf-8"))
+    if extract is not None:
+        data = extract(data)
+    store_cached(
+        url,
+        {
+            "etag": response_headers.get("ETag"),
+            "last_modified": response_headers.get("Last-Modified"),
+            "body": data,
+            "fetched_at": time.time(),
+        },
+    )
+    return data
+
+
+def fetch_tags_graphql(token, timeout=30):
+    """Fetch the newest tag names via the GraphQL API (requires a token).
+
+    Returns the same [{"name": ...}] shape as tag_names(), newest first.
+    """
+    cache_key = GITHUB_GRAPHQL_URL + GITHUB_TAGS_QUERY
+    cached = load_cached(cache_key)
+    if cached and time.time() - cached.get("fetched_at", 0) < CACHE_TTL:
+        print("Using cached GraphQL tags response", file=sys.stderr)
+        return cached["body"]
+
+    headers = {
+        "Authorization": f"bearer {token}",
+        "Content-Type": "application/json",
+        "User-Agent": "gentoo-get-latest-version/1.0",
+    }
+    payload = json.dumps({"query": GITHUB_TAGS_QUERY}).encode("utf-8")
+
+    try:
+        status, _, body = http_request(
+            GITHUB_GRAPHQL_URL, headers, timeout=timeout, method="POST", body=payload
+        )
+    except (http.client.HTTPException, OSError) as e:
+        print(f"Error fetching from GitHub GraphQL API: {e}", file=sys.stderr)
+        raise RuntimeError(f"Failed to connect to GitHub GraphQL API: {e}")
+
+    if status != 200:
+        print(
+            f"Error fetching from GitHub GraphQL API: HTTP Error {status}",
+            file=sys.stderr,
+        )
+        raise RuntimeError(f"GitHub GraphQL API returned HTTP {status}")
+
+    data = json.loads(body.decode("utf-8"))
+    if data.get("errors"):
+        print(f"GitHub GraphQL API errors: {data['errors']}", file=sys.stderr)
+        raise RuntimeError("GitHub GraphQL API returned errors")
+
+    try:
+        nodes = data["data"]["repository"]["refs"]["nodes"]
+    except (KeyError, TypeError):
+        raise RuntimeError("Unexpected GitHub GraphQL API response")
+
+    tags = tag_names(nodes)
+    store_cached(cache_key, {"body": tags, "fetched_at": time.time()})
+    return tags
+
 
 def fetch_from_web():
     """Fetch version from GitHub web page (fallback when API is rate limited)."""
@@ -62,46 +312,45 @@ def fetch_from_web():
         "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
         "Accept-Language": "en-US,en;q=0.5",
-        "Accept-Encoding": "identity",
     }
 
-    req = urllib.request.Request(GITHUB_RELEASES_URL, headers=headers, method="GET")
-
     try:
-        # Follow redirects
-        redirect_handler = urllib.request.HTTPRedirectHandler()
-        opener = urllib.request.build_opener(redirect_handler)
-        urllib.request.install_opener(opener)
-
-        with urllib.request.urlopen(req, timeout=30) as response:
-            final_url = response.geturl()
-            print(f"Final URL after redirect: {final_url}", file=sys.stderr)
-
-            # Extract version from URL
-            match = re.search(r"/releases/tag/(?:v)?([^/]+)$", final_url)
-            if match:
-                tag_name = match.group(1)
+        url = GITHUB_RELEASES_URL
+        status, response_headers, body = http_request(url, headers)
+        if status in (301, 302, 303, 307, 308):
+            # The Location header of the redirect already names the release
+            # tag; only fetch the page itself when it doesn't
+            url = urllib.parse.urljoin(url, response_headers.get("Location", ""))
+            print(f"Redirected to: {url}", file=sys.stderr)
+
+            # Extract version from URL like .../releases/tag/2.58.0
+            path = urllib.parse.urlsplit(url).path
+            _, sep, tag_name = path.rpartition("/releases/tag/")
+            if sep and tag_name and "/" not in tag_name:
+                tag_name = tag_name.removeprefix("v")
                 print(f"Found tag from redirect URL: {tag_name}", file=sys.stderr)
                 return tag_name
 
-            # Try parsing HTML content
-            html = response.read().decode("utf-8")
+            status, response_headers, body = http_request(url, headers)
+        if status != 200:
+            raise RuntimeError(f"HTTP {status} from {url}")
 
-            # Look for version in page title or content
-            title_match = re.search(
-                r"<title>\s*Release\s+(?:v)?([\d.]+)", html, re.IGNORECASE
-            )
-            if title_match:
-                version = title_match.group(1)
-                print(f"Found version from page title: {version}", file=sys.stderr)
-                return version
-
-            # Look for version in URL patterns in the HTML
-            version_match = re.search(r'/releases/tag/(?:v)?([\d.]+)"', html)
-            if version_match:
-                version = version_match.group(1)
-                print(f"Found version from HTML: {version}", file=sys.stderr)
-                return version
+        # Try parsing HTML content
+        html = body.decode("utf-8")
+
+        # Look for version in page title or content
+        title_match = _TITLE_VERSION_RE.search(html)
+        if title_match:
+            version = title_match.group(1)
+            print(f"Found version from page title: {version}", file=sys.stderr)
+            return version
+
+        # Look for version in URL patterns in the HTML
+        version_match = _HTML_TAG_RE.search(html)
+        if version_match:
+            version = version_match.group(1)
+            print(f"Found version from HTML: {version}", file=sys.stderr)
+            return version
 
     except Exception as e:
         print(f"Error fetching from web: {e}", file=sys.stderr)
@@ -109,13 +358,16 @@ def fetch_from_web():
     raise RuntimeError("Failed to fetch version from web fallback")
 
 
+# Memoized so callers importing this module pay for one lookup per process;
+# failures raise and are not cached.
+@functools.lru_cache(maxsize=None)
 def fetch_latest_version():
     """Fetch latest stable version from GitHub releases API."""
     tag_name = None
 
     try:
         # Try releases API first
-        data = make_api_request(GITHUB_API_URL)
+        data = make_api_request(GITHUB_API_URL, extract=release_fields)
 
         # Get the tag name
         tag_name = data.get("tag_name")
@@ -131,10 +383,15 @@ def fetch_latest_version():
             raise RuntimeError(f"Latest release {tag_name} is a pre-release, skipping")
 
     except RuntimeError:
-        # Fallback 1: try tags API (different rate limit bucket)
+        # Fallback 1: try tags API (different rate limit bucket). GraphQL
+        # needs a token but returns only the newest tag names.
         print(f"Falling back to tags API...", file=sys.stderr)
         try:
-            tags_data = make_api_request(GITHUB_TAGS_URL)
+            token = os.environ.get("GITHUB_TOKEN")
+            if token:
+                tags_data = fetch_tags_graphql(token)
+            else:
+                tags_data = make_api_request(GITHUB_TAGS_URL, extract=tag_names)
             if not tags_data:
                 raise RuntimeError("No tags found in repository")
 
@@ -142,7 +399,7 @@ def fetch_latest_version():
             for tag in tags_data:
                 tag_name = tag.get("name", "")
                 # Skip pre-release tags (containing alpha, beta, rc, pre, dev)
-                if re.search(r"-(alpha|beta|rc|pre|dev)", tag_name, re.I):
+                if _PRERELEASE_RE.search(tag_name):
                     print(f"Skipping pre-release tag: {tag_name}", file=sys.stderr)
                     continue
                 print(f"Found tag: {tag_name}", file=sys.stderr)
@@ -160,10 +417,10 @@ def fetch_latest_version():
             tag_name = fetch_from_web()
 
     # Remove 'v' prefix if present
-    version = re.sub(r"^v", "", tag_name)
+    version = tag_name.removeprefix("v")
 
     # Validate version format (should be x.y.z or similar)
-    if not re.match(r"^\d[\d.]*$", version):
+    if not _VERSION_RE.match(version):
         print(f"Warning: Unexpected version format: {version}", file=sys.stderr)
         raise RuntimeError(f"Invalid version format: {version}")
 
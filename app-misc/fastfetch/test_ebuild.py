@@ -4,15 +4,48 @@ Black-box smoke test for app-misc/fastfetch.
 Usage: python3 test_ebuild.py VERSION
 """
 
+import asyncio
 import os
-import subprocess
+import re
+import shutil
 import sys
 
 
-def run_test(name, func):
+async def run_command(cmd, timeout):
+    """Run cmd and return (returncode, output) with stderr merged into stdout."""
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
+    )
+    try:
+        output, _ = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    return proc.returncode, output.decode(errors="replace")
+
+
+async def capture_probes():
+    """Invoke fastfetch once per mode, concurrently; tests share the captured
+    output.
+
+    Returns (version_probe, run_probe); a probe that could not run is
+    returned as its exception.
+    """
+    return await asyncio.gather(
+        run_command(["fastfetch", "--version"], timeout=10),
+        run_command(["fastfetch"], timeout=30),
+        return_exceptions=True,
+    )
+
+
+def run_test(name, func, *args):
     """Run a test and print result."""
     try:
-        result = func()
+        for arg in args:
+            if isinstance(arg, BaseException):
+                raise arg
+        result = func(*args)
         if result:
             print(f"[PASS] {name}")
             return True
@@ -24,35 +57,28 @@ def run_test(name, func):
         return False
 
 
-def test_version_output(version):
-    """Verify version string appears in program output."""
-    try:
-        result = subprocess.run(
-            ["fastfetch", "--version"], capture_output=True, text=True, timeout=10
-        )
-        output = result.stdout + result.stderr
-        return version in output
-    except Exception:
-        return False
+def test_version_output(version, probe):
+    """Verify `fastfetch --version` prints a banner line with VERSION.
 
+    Any line may hold it: stderr is merged in, so warnings (locale, GPU
+    probes) can come first.
+    """
+    _, output = probe
+    banner = re.compile(rf"^fastfetch\s+v?{re.escape(version)}(?![\w.])", re.M)
+    return banner.search(output) is not None
 
-def test_fastfetch_runs(version):
+
+def test_fastfetch_runs(probe):
     """Test that fastfetch executes and produces output."""
-    try:
-        result = subprocess.run(
-            ["fastfetch"], capture_output=True, text=True, timeout=30
-        )
-        if result.returncode != 0:
-            return False
-        output = result.stdout + result.stderr
-        return len(output) > 0
-    except Exception:
+    returncode, output = probe
+    if returncode != 0:
         return False
+    return len(output) > 0
 
 
 def test_binary_installed():
-    """Verify the fastfetch binary is installed."""
-    return os.path.isfile("/usr/bin/fastfetch")
+    """Verify the fastfetch binary is installed and on PATH."""
+    return shutil.which("fastfetch") is not None
 
 
 def test_man_page_installed():
@@ -64,38 +90,24 @@ def test_man_page_installed():
     return any(os.path.isfile(p) for p in man_paths)
 
 
-def test_fastfetch_help():
-    """Test that help output works."""
-    try:
-        result = subprocess.run(
-            ["fastfetch", "--help"], capture_output=True, text=True, timeout=10
-        )
-        if result.returncode != 0:
-            return False
-        output = result.stdout + result.stderr
-        return len(output) > 0 and "fastfetch" in output.lower()
-    except Exception:
-        return False
-
-
 def main():
     if len(sys.argv) < 2:
         print("Usage: python3 test_ebuild.py VERSION")
         sys.exit(1)
 
     version = sys.argv[1]
+    version_probe, run_probe = asyncio.run(capture_probes())
     tests = [
         ("Binary installed", test_binary_installed),
-        ("Version output", lambda: test_version_output(version)),
-        ("Help output", test_fastfetch_help),
-        ("Runs and produces output", lambda: test_fastfetch_runs(version)),
+        ("Version output", test_version_output, version, version_probe),
+        ("Runs and produces output", test_fastfetch_runs, run_probe),
     ]
 
     passed = 0
     failed = 0
 
-    for name, test_func in tests:
-        if run_test(name, test_func):
+    for name, test_func, *args in tests:
+        if run_test(name, test_func, *args):
             passed += 1
         else:
             failed += 1
@@ -5,6 +5,7 @@ Gentoo AI Ebuild Update Orchestrator
 Usage:
     python3 update.py app-editors/neovim
     python3 update.py app-editors/neovim::gentoo
+    python3 update.py --jobs 2 app-editors/neovim app-misc/fastfetch
     python3 update.py --help
 
 This script delegates all "smart" work to opencode AI agents.
@@ -12,6 +13,10 @@ It only handles file I/O, subprocess calls, and decision flow.
 """
 
 import argparse
+import asyncio
+import atexit
+import collections
+import functools
 import glob
 import os
 import re
@@ -19,6 +24,7 @@ import shutil
 import subprocess
 import sys
 import textwrap
+import threading
 import xml.etree.ElementTree as ET
 from pathlib import Path
 
@@ -30,37 +36,92 @@ REPO_DIR = Path("/var/db/repos/gentoo-ai-update-repo")
 SYSTEM_REPOS_DIR = Path("/var/db/repos")
 AI_MODEL_WEB = "opencode/kimi-k2.5-free"  # Good at web/API info, version checking
 AI_MODEL_CODE = "opencode/minimax-m2.1-free"  # Good at writing code, ebuilds, tests
+AI_MODEL_FAST = "opencode/gpt-5-nano"  # Cheap and quick: small targeted fixes
 MAX_VERSION_RETRIES = 5
+OUTPUT_TAIL_LINES = 8192  # Lines of stdout/stderr kept per command for error reports
 CONTAINER_IMAGE = "docker.io/gentoo/stage3"
+LOG_COLORS = {
+    "INFO": "\033[36m",
+    "OK": "\033[32m",
+    "WARN": "\033[33m",
+    "ERR": "\033[31m",
+    "AI": "\033[35m",
+}
+LOG_RESET = "\033[0m"
+
+# What get_latest_version.py may print. The version ends up in ebuild file
+# names and in the container's bash script, so anything beyond a plain
+# version string is rejected.
+_VERSION_RE = re.compile(r"\A[0-9][0-9A-Za-z.+_~-]*\Z")
+_RN_SUFFIX_RE = re.compile(r"-r\d+$")  # Ebuild revision, e.g. the "-r1" in 0.11.3-r1
+
+# Ebuild variables shown in CLAUDE.md, plus the inherit line. A quoted value
+# may span several lines (e.g. a multi-line SRC_URI). Matched against the raw
+# file bytes so only the captured values are ever decoded.
+EBUILD_VAR_RE = re.compile(
+    rb"""
+    ^[ \t]*(?:
+        (?P<key>HOMEPAGE|SRC_URI|DESCRIPTION|SLOT|IUSE|LICENSE)=
+        (?:"(?P<dq>(?:[^"\\]|\\.)*)"|'(?P<sq>[^']*)'|(?P<bare>\S*))
+      | inherit[ \t]+(?P<inherit>[^\n]*)
+    )
+    """,
+    re.MULTILINE | re.VERBOSE,
+)
+
+# Background `podman pull` started by start_image_pull(), if the image was missing
+_pull_proc: subprocess.Popen | None = None
 
 # ─── Helpers ──────────────────────────────────────────────────────────────────
 
 
 def log(msg: str, level: str = "INFO"):
-    colors = {
-        "INFO": "\033[36m",
-        "OK": "\033[32m",
-        "WARN": "\033[33m",
-        "ERR": "\033[31m",
-        "AI": "\033[35m",
-    }
-    reset = "\033[0m"
-    c = colors.get(level, "")
-    print(f"{c}[{level}]{reset} {msg}", file=sys.stderr)
+    c = LOG_COLORS.get(level, "")
+    print(f"{c}[{level}]{LOG_RESET} {msg}", file=sys.stderr)
+
+
+def _drain(pipe, tail: collections.deque) -> None:
+    """Read pipe line by line into tail."""
+    with pipe:
+        for line in pipe:
+            tail.append(line)
 
 
 def run_cmd(
     cmd: list[str], cwd: str | None = None, capture: bool = True
 ) -> subprocess.CompletedProcess:
-    """Run a command and return result. Does NOT raise on failure."""
+    """Run a command and return result. Does NOT raise on failure.
+
+    Captured runs keep only the last OUTPUT_TAIL_LINES lines of stdout and
+    stderr, however chatty the command is.
+    """
     log(f"$ {' '.join(cmd)}")
-    if capture:
-        r = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True)
-    else:
+    if not capture:
         # Stream output to terminal in real-time, capture nothing
         r = subprocess.run(cmd, cwd=cwd)
-        r = subprocess.CompletedProcess(cmd, r.returncode, stdout="", stderr="")
-    return r
+        return subprocess.CompletedProcess(cmd, r.returncode, stdout="", stderr="")
+    proc = subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors="replace",
+    )
+    tails = []
+    readers = []
+    for pipe in (proc.stdout, proc.stderr):
+        tail = collections.deque(maxlen=OUTPUT_TAIL_LINES)
+        reader = threading.Thread(target=_drain, args=(pipe, tail), daemon=True)
+        reader.start()
+        tails.append(tail)
+        readers.append(reader)
+    returncode = proc.wait()
+    for reader in readers:
+        reader.join()
+    return subprocess.CompletedProcess(
+        cmd, returncode, stdout="".join(tails[0]), stderr="".join(tails[1])
+    )
 
 
 def run_ai(
@@ -92,29 +153,34 @@ def parse_package_atom(atom: str) -> tuple[str, str, str | None]:
     return parts[0], parts[1], repo_hint
 
 
+@functools.cache
+def _system_repos() -> tuple[str, ...]:
+    """Repos to search for source packages: gentoo first, then the others by
+    name. Read once; the set of repos doesn't change during a run."""
+    # DirEntry.is_dir() answers from the directory read for non-symlinks
+    with os.scandir(SYSTEM_REPOS_DIR) as it:
+        others = sorted(
+            e.name
+            for e in it
+            if e.is_dir() and e.name not in ("gentoo", "gentoo-ai-update-repo")
+        )
+    return ("gentoo", *others)
+
+
 def find_source_package(
     category: str, package: str, repo_hint: str | None
 ) -> Path | None:
     """Find package directory in system repos."""
     if repo_hint:
         candidate = SYSTEM_REPOS_DIR / repo_hint / category / package
-        if candidate.is_dir():
+        if os.path.isdir(candidate):
             return candidate
         log(f"Package not found in repo '{repo_hint}': {candidate}", "WARN")
 
     # Search all repos (gentoo first, then others)
-    search_order = ["gentoo"]
-    for d in sorted(SYSTEM_REPOS_DIR.iterdir()):
-        if (
-            d.name not in search_order
-            and d.name != "gentoo-ai-update-repo"
-            and d.is_dir()
-        ):
-            search_order.append(d.name)
-
-    for repo_name in search_order:
+    for repo_name in _system_repos():
         candidate = SYSTEM_REPOS_DIR / repo_name / category / package
-        if candidate.is_dir():
+        if os.path.isdir(candidate):
             log(f"Found source package: {candidate}")
             return candidate
     return None
@@ -130,26 +196,31 @@ def extract_version_from_ebuild(ebuild_path: Path, pkg_name: str) -> str:
 
 def _version_sort_key(pkg_name: str):
     """Return a sort key function that uses portage vercmp."""
-    import functools
+    version = functools.partial(extract_version_from_ebuild, pkg_name=pkg_name)
+    return functools.cmp_to_key(lambda a, b: vercmp(version(a), version(b)) or 0)
 
-    def cmp_ebuilds(a: Path, b: Path) -> int:
-        va = extract_version_from_ebuild(a, pkg_name)
-        vb = extract_version_from_ebuild(b, pkg_name)
-        return vercmp(va, vb) or 0
 
-    return functools.cmp_to_key(cmp_ebuilds)
+@functools.lru_cache(maxsize=256)
+def _sorted_ebuild_names(pkg_dir: str, mtime_ns: int, pkg_name: str) -> tuple[str, ...]:
+    """Uncached body of get_ebuilds. Adding, removing or renaming an ebuild
+    bumps the directory's mtime_ns, which invalidates the entry."""
+    candidates = [p for p in Path(pkg_dir).glob("*.ebuild") if "-9999" not in p.stem]
+    candidates.sort(key=_version_sort_key(pkg_name))
+    return tuple(p.name for p in candidates)
 
 
 def get_ebuilds(pkg_dir: Path, pkg_name: str | None = None) -> list[Path]:
     """Return sorted list of ebuild files (excluding 9999), ordered by version.
 
-    If pkg_name is provided, uses portage vercmp for correct version ordering.
-    Otherwise falls back to filename sorting.
+    Uses portage vercmp, so 1.10 sorts after 1.9 and -r10 after -r2. pkg_name
+    defaults to the directory name, which is the package name in any repo.
     """
-    candidates = [p for p in pkg_dir.glob("*.ebuild") if "-9999" not in p.stem]
-    if pkg_name:
-        return sorted(candidates, key=_version_sort_key(pkg_name))
-    return sorted(candidates, key=lambda p: p.stem)
+    try:
+        mtime_ns = pkg_dir.stat().st_mtime_ns
+    except FileNotFoundError:
+        return []
+    names = _sorted_ebuild_names(str(pkg_dir), mtime_ns, pkg_name or pkg_dir.name)
+    return [pkg_dir / name for name in names]
 
 
 def get_latest_version_from_ebuilds(pkg_dir: Path, pkg_name: str) -> str | None:
@@ -161,13 +232,11 @@ def get_latest_version_from_ebuilds(pkg_dir: Path, pkg_name: str) -> str | None:
 
 
 def version_exists(pkg_dir: Path, pkg_name: str, version: str) -> bool:
-    """Check if an ebuild for this version already exists."""
-    for eb in pkg_dir.glob(f"{pkg_name}-{version}*.ebuild"):
-        v = extract_version_from_ebuild(eb, pkg_name)
-        base_v = re.sub(r"-r\d+$", "", v)
-        if base_v == version:
-            return True
-    return False
+    """Check if an ebuild for this version (any revision) already exists."""
+    return any(
+        _RN_SUFFIX_RE.sub("", extract_version_from_ebuild(eb, pkg_name)) == version
+        for eb in get_ebuilds(pkg_dir)
+    )
 
 
 def is_newer_version(upstream: str, local: str) -> bool:
@@ -181,7 +250,7 @@ def is_newer_version(upstream: str, local: str) -> bool:
 
 def extract_ebuild_info(ebuild_path: Path) -> dict:
     """Extract key info from an ebuild file for CLAUDE.md generation."""
-    content = ebuild_path.read_text()
+    content = ebuild_path.read_bytes()
     info = {
         "homepage": "",
         "src_uri": "",
@@ -192,41 +261,13 @@ def extract_ebuild_info(ebuild_path: Path) -> dict:
         "license": "",
     }
 
-    for line in content.splitlines():
-        line = line.strip()
-        if line.startswith("HOMEPAGE="):
-            info["homepage"] = line.split("=", 1)[1].strip('"').strip("'")
-        elif line.startswith("SRC_URI="):
-            info["src_uri"] = line.split("=", 1)[1].strip('"').strip("'")
-        elif line.startswith("inherit "):
-            info["inherit"] = line[len("inherit ") :]
-        elif line.startswith("DESCRIPTION="):
-            info["description"] = line.split("=", 1)[1].strip('"').strip("'")
-        elif line.startswith("SLOT="):
-            info["slot"] = line.split("=", 1)[1].strip('"').strip("'")
-        elif line.startswith("IUSE="):
-            info["iuse"] = line.split("=", 1)[1].strip('"').strip("'")
-        elif line.startswith("LICENSE="):
-            info["license"] = line.split("=", 1)[1].strip('"').strip("'")
-
-    # Multi-line SRC_URI — grab the whole block
-    if not info["src_uri"]:
-        in_src_uri = False
-        src_lines = []
-        for line in content.splitlines():
-            stripped = line.strip()
-            if stripped.startswith("SRC_URI="):
-                in_src_uri = True
-                src_lines.append(stripped.split("=", 1)[1].strip('"').strip("'"))
-                if not stripped.endswith('"'):
-                    continue
-                else:
-                    in_src_uri = False
-            elif in_src_uri:
-                src_lines.append(stripped.rstrip('"').rstrip("'"))
-                if stripped.endswith('"') or stripped.endswith("'"):
-                    in_src_uri = False
-        info["src_uri"] = " ".join(src_lines).strip()
+    # Later assignments win, as they would for the shell
+    for m in EBUILD_VAR_RE.finditer(content):
+        if m["inherit"] is not None:
+            info["inherit"] = m["inherit"].decode("utf-8", "replace").strip()
+        else:
+            value = (m["dq"] or m["sq"] or m["bare"] or b"").decode("utf-8", "replace")
+            info[m["key"].decode().lower()] = " ".join(value.split())
 
     return info
 
@@ -237,13 +278,18 @@ def extract_remote_id(metadata_path: Path) -> dict:
     if not metadata_path.exists():
         return result
     try:
-        tree = ET.parse(metadata_path)
-        root = tree.getroot()
-        for upstream in root.findall("upstream"):
-            for remote in upstream.findall("remote-id"):
-                result["type"] = remote.get("type", "")
-                result["value"] = remote.text or ""
+        # Stream the document and stop at the first <pkgmetadata><upstream>
+        # <remote-id>, instead of building the whole tree
+        path = []
+        for event, elem in ET.iterparse(metadata_path, events=("start", "end")):
+            if event == "start":
+                path.append(elem.tag)
+                continue
+            if path[1:] == ["upstream", "remote-id"]:
+                result["type"] = elem.get("type", "")
+                result["value"] = elem.text or ""
                 return result  # Return first one
+            path.pop()
     except ET.ParseError:
         log(f"Failed to parse {metadata_path}", "WARN")
     return result
@@ -253,7 +299,7 @@ def generate_package_claude_md(
     pkg_dir: Path, category: str, package: str, ebuild_info: dict, remote_id: dict
 ) -> None:
     """Generate package-level CLAUDE.md."""
-    content = f"""# {category}/{package}
+    parts = [f"""# {category}/{package}
 
 ## Package Info
 - **Description**: {ebuild_info["description"]}
@@ -269,42 +315,67 @@ def generate_package_claude_md(
 ## Upstream
 - **Remote-ID type**: {remote_id["type"]}
 - **Remote-ID value**: {remote_id["value"]}
-"""
+"""]
 
     # Add type-specific hints
     if remote_id["type"] == "github":
         owner, repo = (remote_id["value"].split("/", 1) + [""])[:2]
-        content += f"""
+        parts.append(f"""
 ## GitHub API
 - Releases: `https://api.github.com/repos/{owner}/{repo}/releases/latest`
 - Tags: `https://api.github.com/repos/{owner}/{repo}/tags`
-"""
+""")
     elif remote_id["type"] == "pypi":
-        content += f"""
+        parts.append(f"""
 ## PyPI API
 - JSON: `https://pypi.org/pypi/{remote_id["value"]}/json`
-"""
+""")
     elif remote_id["type"] == "crates-io":
-        content += f"""
+        parts.append(f"""
 ## Crates.io API
 - JSON: `https://crates.io/api/v1/crates/{remote_id["value"]}`
-"""
+""")
 
-    content += """
+    parts.append("""
 ## Notes
 - Read the existing ebuild carefully before making changes
 - Check `files/` directory for patches that may need updating
-- Run `ebuild *.ebuild manifest` after creating new ebuild
-- Run `pkgcheck scan` for QA check
-"""
+- Manifest and `pkgcheck scan` are run by update.py after the new ebuild is created
+- Only re-run them when asked to fix their reported failures
+""")
 
-    (pkg_dir / "CLAUDE.md").write_text(content)
+    (pkg_dir / "CLAUDE.md").write_bytes("".join(parts).encode())
     log(f"Generated {pkg_dir}/CLAUDE.md")
 
 
 # ─── Core Actions ─────────────────────────────────────────────────────────────
 
 
+def _clone_or_copy(src: str, dst: str) -> None:
+    """copytree copy_function: copy src to dst inside the kernel.
+
+    copy_file_range shares extents (reflink) on btrfs/XFS and avoids the
+    userspace round trip elsewhere; shutil.copy2 is the fallback when the
+    filesystem pair doesn't support it.
+    """
+    # Never write through an existing dst: it may share an inode with src
+    # (e.g. a hardlink left by an older setup) and truncating it would
+    # truncate the system repo's file too
+    if os.path.lexists(dst):
+        os.unlink(dst)
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    raise OSError(f"copy_file_range stopped short on {src}")
+                remaining -= copied
+        shutil.copystat(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
 def setup_package(category: str, package: str, repo_hint: str | None) -> Path:
     """Ensure package exists in our overlay. Copy from source if needed."""
     our_pkg_dir = REPO_DIR / category / package
@@ -323,15 +394,16 @@ def setup_package(category: str, package: str, repo_hint: str | None) -> Path:
     log(f"Copying {source_dir} → {our_pkg_dir}")
     our_pkg_dir.mkdir(parents=True, exist_ok=True)
 
-    # Copy ebuilds, metadata.xml, Manifest, files/
-    for item in source_dir.iterdir():
-        if item.name in (".git", "__pycache__"):
-            continue
-        dest = our_pkg_dir / item.name
-        if item.is_dir():
-            shutil.copytree(item, dest, dirs_exist_ok=True)
-        else:
-            shutil.copy2(item, dest)
+    # Copy ebuilds, metadata.xml, Manifest, files/. Every file gets its own
+    # inode (reflinked where the filesystem allows), so edits in the overlay
+    # can never reach the system repo.
+    shutil.copytree(
+        source_dir,
+        our_pkg_dir,
+        dirs_exist_ok=True,
+        ignore=shutil.ignore_patterns(".git", "__pycache__"),
+        copy_function=_clone_or_copy,
+    )
 
     # Generate package CLAUDE.md
     ebuilds = get_ebuilds(our_pkg_dir, package)
@@ -411,7 +483,7 @@ def run_get_latest_version(
 
         if result.returncode == 0:
             version = result.stdout.strip()
-            if version and re.match(r"^[0-9]", version):
+            if _VERSION_RE.match(version):
                 log(f"Got version: {version}", "OK")
                 return version
             else:
@@ -445,13 +517,13 @@ def run_get_latest_version(
         Read CLAUDE.md for package info. Test the fix by running: python3 get_latest_version.py
     """)
 
-    fix_result = run_ai(fix_prompt, cwd=str(pkg_dir))
+    fix_result = run_ai(fix_prompt, cwd=str(pkg_dir), model=AI_MODEL_FAST)
 
     # Retry once after fix
     result = run_cmd(["python3", str(script_path)], cwd=str(pkg_dir))
     if result.returncode == 0:
         version = result.stdout.strip()
-        if version and re.match(r"^[0-9]", version):
+        if _VERSION_RE.match(version):
             log(f"Got version after fix: {version}", "OK")
             return version
 
@@ -489,7 +561,7 @@ def _ai_web_search_version(pkg_dir: Path, category: str, package: str) -> str |
         run_result = run_cmd(["python3", str(script_path)], cwd=str(pkg_dir))
         if run_result.returncode == 0:
             version = run_result.stdout.strip()
-            if version and re.match(r"^[0-9]", version):
+            if _VERSION_RE.match(version):
                 log(f"Got version via web search fallback: {version}", "OK")
                 return version
 
@@ -498,7 +570,8 @@ def _ai_web_search_version(pkg_dir: Path, category: str, package: str) -> str |
 
 
 def update_ebuild(pkg_dir: Path, category: str, package: str, new_version: str) -> bool:
-    """Ask AI to create new version ebuild, generate manifest, run pkgcheck."""
+    """Ask AI to create new version ebuild, then generate manifest and run
+    pkgcheck, with a quick AI fix-up pass if either fails."""
     log(f"Updating ebuild to version {new_version} ...", "AI")
 
     ebuilds = get_ebuilds(pkg_dir, package)
@@ -519,11 +592,8 @@ def update_ebuild(pkg_dir: Path, category: str, package: str, new_version: str)
            - Patches in files/ reference the old version
            - SRC_URI pattern needs adjustment
            - Dependencies have changed upstream
-        3. Generate Manifest:
-           Run: ebuild {package}-{new_version}.ebuild manifest
-        4. Run: pkgcheck scan
-           Fix any errors. Warnings are OK.
 
+        Manifest generation and pkgcheck are run for you afterwards.
         Read CLAUDE.md for package-specific info.
         Do NOT modify or remove old ebuilds.
         Do NOT commit anything.
@@ -538,18 +608,47 @@ def update_ebuild(pkg_dir: Path, category: str, package: str, new_version: str)
         log(f"AI stdout: {result.stdout[:500]}", "ERR")
         return False
 
-    # Verify Manifest was updated
-    manifest = pkg_dir / "Manifest"
-    if not manifest.exists():
-        log("Manifest not found — trying to generate...", "WARN")
-        run_cmd(["ebuild", str(new_ebuild), "manifest"], cwd=str(pkg_dir))
-
-    # Final pkgcheck
-    log("Running final pkgcheck scan...")
-    pkgcheck_result = run_cmd(["pkgcheck", "scan"], cwd=str(pkg_dir))
+    # Manifest and QA are mechanical; only failures need the (fast) AI
+    manifest_cmd = ["ebuild", str(new_ebuild), "manifest"]
+    manifest_result = run_cmd(manifest_cmd, cwd=str(pkg_dir))
+    # Scan only the new ebuild so pre-existing issues elsewhere can't fail it
+    pkgcheck_cmd = ["pkgcheck", "scan", str(new_ebuild)]
+    log("Running pkgcheck scan...")
+    pkgcheck_result = run_cmd(pkgcheck_cmd, cwd=str(pkg_dir))
+    if manifest_result.returncode != 0 or pkgcheck_result.returncode != 0:
+        log("Manifest or pkgcheck failed. Asking AI to fix ...", "AI")
+        fix_prompt = textwrap.dedent(f"""\
+            {new_ebuild.name} was just created from {latest_ebuild.name}.
+
+            `ebuild {new_ebuild.name} manifest` exited {manifest_result.returncode}:
+            {manifest_result.stderr[-2000:]}
+
+            `pkgcheck scan {new_ebuild.name}` exited {pkgcheck_result.returncode}:
+            {pkgcheck_result.stdout[-2000:]}
+
+            Fix {new_ebuild.name} (and files/ if needed) so that both commands
+            succeed; re-run them to check. pkgcheck warnings are OK.
+            Do NOT modify or remove old ebuilds.
+        """)
+        run_ai(fix_prompt, cwd=str(pkg_dir), model=AI_MODEL_FAST)
+        # Check both again: the fix may have touched SRC_URI or distfiles
+        manifest_result = run_cmd(manifest_cmd, cwd=str(pkg_dir))
+        log("Running final pkgcheck scan...")
+        pkgcheck_result = run_cmd(pkgcheck_cmd, cwd=str(pkg_dir))
     if pkgcheck_result.stdout:
         log(f"pkgcheck output:\n{pkgcheck_result.stdout}", "WARN")
 
+    if manifest_result.returncode != 0:
+        log(
+            f"ebuild manifest still failing (exit {manifest_result.returncode}):\n"
+            f"{manifest_result.stderr[-2000:]}",
+            "ERR",
+        )
+        return False
+    if pkgcheck_result.returncode != 0:
+        log(f"pkgcheck scan still failing (exit {pkgcheck_result.returncode})", "ERR")
+        return False
+
     log(f"Ebuild {new_ebuild.name} created successfully", "OK")
     return True
 
@@ -623,6 +722,62 @@ def ensure_test_script(pkg_dir: Path, category: str, package: str) -> Path | Non
         return None
 
 
+def start_image_pull() -> None:
+    """Start pulling CONTAINER_IMAGE in the background if it isn't present yet,
+    so the download overlaps with the AI steps."""
+    global _pull_proc
+    try:
+        check = run_cmd(["podman", "image", "exists", CONTAINER_IMAGE])
+        if check.returncode == 0:
+            return
+        log(f"Pulling {CONTAINER_IMAGE} in the background ...")
+        _pull_proc = subprocess.Popen(
+            ["podman", "pull", "--quiet", CONTAINER_IMAGE],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        atexit.register(stop_image_pull)
+    except OSError as e:
+        # No podman; run_container_test reports it when a test is due
+        log(f"Could not start image pull: {e}", "WARN")
+
+
+def stop_image_pull() -> None:
+    """Stop a background pull nobody waited for (no update, failure, Ctrl-C)."""
+    global _pull_proc
+    if _pull_proc is None:
+        return
+    proc, _pull_proc = _pull_proc, None
+    if proc.poll() is None:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
+def ensure_image_pulled() -> bool:
+    """Wait for the background pull; pull in the foreground if it failed or
+    never ran."""
+    global _pull_proc
+    if _pull_proc is not None:
+        proc, _pull_proc = _pull_proc, None
+        if proc.wait() == 0:
+            return True
+        log("Background image pull failed — retrying", "WARN")
+
+    # Check if container image exists, pull if needed
+    check = run_cmd(["podman", "image", "exists", CONTAINER_IMAGE])
+    if check.returncode != 0:
+        log(f"Pulling {CONTAINER_IMAGE} (first time) ...", "AI")
+        pull = run_cmd(["podman", "pull", CONTAINER_IMAGE], capture=False)
+        if pull.returncode != 0:
+            log("Failed to pull container image", "ERR")
+            return False
+    return True
+
+
 def run_container_test(
     pkg_dir: Path, category: str, package: str, version: str
 ) -> bool:
@@ -634,14 +789,8 @@ def run_container_test(
 
     log(f"Running container test for {category}/{package}-{version} ...")
 
-    # Check if container image exists, pull if needed
-    check = run_cmd(["podman", "image", "exists", CONTAINER_IMAGE])
-    if check.returncode != 0:
-        log(f"Pulling {CONTAINER_IMAGE} (first time) ...", "AI")
-        pull = run_cmd(["podman", "pull", CONTAINER_IMAGE], capture=False)
-        if pull.returncode != 0:
-            log("Failed to pull container image", "ERR")
-            return False
+    if not ensure_image_pulled():
+        return False
 
     # Run container with host repos mounted
     # The stage3 image has a profile symlink to /var/db/repos/gentoo/profiles/...
@@ -702,43 +851,38 @@ def print_summary(
     category: str, package: str, version: str, pkg_dir: Path, test_passed: bool
 ):
     """Print final summary with git suggestions."""
-    print()
-    print("=" * 60)
-    print(f"  Update Summary: {category}/{package}")
-    print("=" * 60)
-    print(f"  New version : {version}")
-    print(f"  Package dir : {pkg_dir}")
-    print(f"  Container   : {'PASSED' if test_passed else 'FAILED / SKIPPED'}")
-    print()
-    print("  Suggested git commands:")
-    print(f"    cd {pkg_dir}")
-    print(f"    git add -A")
-    print(f'    git commit -m "bump {category}/{package} to {version}"')
-    print("=" * 60)
-    print()
+    rule = "=" * 60
+    lines = [
+        "",
+        rule,
+        f"  Update Summary: {category}/{package}",
+        rule,
+        f"  New version : {version}",
+        f"  Package dir : {pkg_dir}",
+        f"  Container   : {'PASSED' if test_passed else 'FAILED / SKIPPED'}",
+        "",
+        "  Suggested git commands:",
+        f"    cd {pkg_dir}",
+        "    git add -A",
+        f'    git commit -m "bump {category}/{package} to {version}"',
+        rule,
+        "",
+    ]
+    # One write so the block isn't interleaved with stderr log lines
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 # ─── Main ─────────────────────────────────────────────────────────────────────
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="AI-driven Gentoo ebuild updater",
-        epilog="Example: python3 update.py app-editors/neovim",
-    )
-    parser.add_argument(
-        "package", help="Package atom: category/package or category/package::repo"
-    )
-    parser.add_argument("--skip-test", action="store_true", help="Skip container test")
-    parser.add_argument(
-        "--force", action="store_true", help="Force update even if version exists"
-    )
-    parser.add_argument(
-        "--dry-run", action="store_true", help="Only check version, don't update"
-    )
-    args = parser.parse_args()
+def check_for_update(
+    category: str, package: str, repo_hint: str | None, force: bool
+) -> tuple[str, str, Path, str | None, str] | None:
+    """Steps 1-4 for one package.
 
-    category, package, repo_hint = parse_package_atom(args.package)
+    Returns (category, package, pkg_dir, current, new_version) when an update
+    should be made, or None when the overlay is already up to date.
+    """
     log(
         f"Processing {category}/{package}"
         + (f" (hint: {repo_hint})" if repo_hint else "")
@@ -753,47 +897,135 @@ def main():
     # Step 3: Get latest version
     new_version = run_get_latest_version(script_path, pkg_dir, category, package)
     if new_version is None:
-        log("Could not determine latest version. Exiting.", "ERR")
+        log(f"Could not determine latest version of {category}/{package}.", "ERR")
         sys.exit(1)
 
     # Step 4: Compare versions using portage vercmp
     current = get_latest_version_from_ebuilds(pkg_dir, package)
 
-    if not args.force:
+    if not force:
         if version_exists(pkg_dir, package, new_version):
             log(
                 f"Already up to date: {category}/{package}-{current} (upstream: {new_version})",
                 "OK",
             )
-            sys.exit(0)
+            return None
 
         if current and not is_newer_version(new_version, current):
             log(
                 f"Upstream {new_version} is NOT newer than local {current} — skipping (possible downgrade)",
                 "WARN",
             )
-            sys.exit(0)
+            return None
 
-    if args.dry_run:
-        log(f"Update available: {current} → {new_version}", "OK")
-        sys.exit(0)
+    return category, package, pkg_dir, current, new_version
 
-    # Step 5: Update ebuild
-    success = update_ebuild(pkg_dir, category, package, new_version)
-    if not success:
-        log("Ebuild update failed. Preserving scene for investigation.", "ERR")
-        sys.exit(1)
 
-    # Step 6: Container test (optional)
-    test_passed = True
-    if not args.skip_test:
-        ensure_test_script(pkg_dir, category, package)
-        test_passed = run_container_test(pkg_dir, category, package, new_version)
-    else:
-        log("Container test skipped (--skip-test)", "WARN")
+async def discover_updates(
+    packages: list[tuple[str, str, str | None]], force: bool, jobs: int
+) -> list:
+    """Run check_for_update for every (category, package, repo_hint), at most
+    `jobs` at a time.
+
+    The steps spend their time waiting on AI and python3 subprocesses, so
+    each package runs in a worker thread. Returns one entry per package; a
+    package whose helpers gave up, or that raised, is returned as its
+    exception so the other packages' results survive.
+    """
+    slots = asyncio.Semaphore(jobs)
+
+    async def process_one(category: str, package: str, repo_hint: str | None):
+        async with slots:
+            try:
+                return await asyncio.to_thread(
+                    check_for_update, category, package, repo_hint, force
+                )
+            except SystemExit as e:
+                return e
+            except Exception as e:
+                log(f"{category}/{package}: {type(e).__name__}: {e}", "ERR")
+                return e
+
+    return await asyncio.gather(*(process_one(*pkg) for pkg in packages))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="AI-driven Gentoo ebuild updater",
+        epilog="Example: python3 update.py app-editors/neovim",
+    )
+    parser.add_argument(
+        "package",
+        nargs="+",
+        help="Package atom: category/package or category/package::repo",
+    )
+    parser.add_argument("--skip-test", action="store_true", help="Skip container test")
+    parser.add_argument(
+        "--force", action="store_true", help="Force update even if version exists"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Only check version, don't update"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=4,
+        help="Packages to set up and version-check concurrently (default: 4)",
+    )
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    # cat/pkg, cat/pkg/ and cat/pkg::repo all share one overlay directory, so
+    # dedupe on (category, package); the first repo hint given wins
+    hints = {}
+    for atom in args.package:
+        category, package, repo_hint = parse_package_atom(atom)
+        hints.setdefault((category, package), repo_hint)
+    packages = [(*key, hint) for key, hint in hints.items()]
+
+    if not (args.skip_test or args.dry_run):
+        start_image_pull()
+    results = asyncio.run(discover_updates(packages, args.force, args.jobs))
+
+    # Steps 5-7 run one package at a time: the ebuild edits and the podman
+    # containers would only contend with each other
+    failed = 0
+    for (category, package, _), result in zip(packages, results):
+        if isinstance(result, BaseException):
+            log(f"Giving up on {category}/{package}", "ERR")
+            failed += 1
+            continue
+        if result is None:
+            continue
+        category, package, pkg_dir, current, new_version = result
+
+        if args.dry_run:
+            log(
+                f"Update available: {category}/{package} {current} → {new_version}",
+                "OK",
+            )
+            continue
+
+        # Step 5: Update ebuild
+        success = update_ebuild(pkg_dir, category, package, new_version)
+        if not success:
+            log("Ebuild update failed. Preserving scene for investigation.", "ERR")
+            failed += 1
+            continue
+
+        # Step 6: Container test (optional)
+        test_passed = True
+        if not args.skip_test:
+            ensure_test_script(pkg_dir, category, package)
+            test_passed = run_container_test(pkg_dir, category, package, new_version)
+        else:
+            log("Container test skipped (--skip-test)", "WARN")
+
+        # Step 7: Summary
+        print_summary(category, package, new_version, pkg_dir, test_passed)
 
-    # Step 7: Summary
-    print_summary(category, package, new_version, pkg_dir, test_passed)
+    sys.exit(1 if failed else 0)
 
 
 if __name__ == "__main__":